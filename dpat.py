@@ -13,18 +13,21 @@ License: See LICENSE file
 
 import argparse
 import binascii
-import html
 import io
+import itertools
 import logging
 import os
 import re
 import sqlite3
 import sys
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from shutil import copyfile
-from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 # Configure logging
 logging.basicConfig(
@@ -34,6 +37,119 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used on every NTDS / potfile line
+_HISTORY_RE = re.compile(r"(.*\\*.*)_history([0-9]+)$", re.I)
+_HEX_RE = re.compile(r"\$HEX\[([^\]]+)")
+_SAFE_NAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Same replacements as html.escape(quote=True), applied in a single pass
+_HTML_TRANS = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'
+})
+
+
+def _esc(value: str) -> str:
+    """Escape a string for inclusion in HTML text or attribute values."""
+    return value.translate(_HTML_TRANS)
+
+
+# LM hash of the empty password, stored when LM hashing is disabled
+LM_EMPTY = "aad3b435b51404eeaad3b435b51404ee"
+# NT hash of the empty password
+NT_EMPTY = "31d6cfe0d16ae931b73c59d7e0c089c0"
+
+
+def _resolve_md4_backend() -> Optional[Callable[[bytes], bytes]]:
+    """
+    Locate a raw MD4 implementation once at import time.
+    
+    Returns:
+        Callable returning the 16-byte MD4 digest of its input, or None if
+        no MD4 backend is installed
+    """
+    try:
+        # 1) pycryptodome → Crypto.*
+        from Crypto.Hash import MD4
+        MD4.new(b'')
+        return lambda data: MD4.new(data).digest()
+    except Exception as e:
+        logger.debug(f"[DEBUG] PyCryptodome (Crypto) MD4 unavailable: {e}")
+    
+    try:
+        # 2) pycryptodomex → Cryptodome.*
+        from Cryptodome.Hash import MD4 as MD4X
+        MD4X.new(b'')
+        return lambda data: MD4X.new(data).digest()
+    except Exception as e:
+        logger.debug(f"[DEBUG] PyCryptodomex (Cryptodome) MD4 unavailable: {e}")
+    
+    try:
+        # 3) hashlib (often unavailable for MD4)
+        import hashlib
+        hashlib.new('md4', b'')
+        return lambda data: hashlib.new('md4', data).digest()
+    except Exception as e:
+        logger.debug(f"[DEBUG] hashlib md4 unavailable: {e}")
+    
+    return None
+
+
+_md4 = _resolve_md4_backend()
+
+
+def _resolve_ntlm_backend() -> Optional[Callable[[str], str]]:
+    """
+    Pick the NT hash implementation once at import time.
+    
+    Returns:
+        Callable mapping a password to its lowercase hex NT hash, or None if
+        no backend is installed
+    """
+    if _md4 is not None:
+        # 1-3) raw MD4 over UTF-16LE from _resolve_md4_backend
+        md4 = _md4
+        return lambda password: md4(password.encode('utf-16le')).hex()
+    
+    try:
+        # 4) passlib
+        from passlib.hash import nthash
+        nthash.hash('')
+        return lambda password: nthash.hash(password).lower()
+    except Exception as e:
+        logger.debug(f"[DEBUG] passlib nthash unavailable: {e}")
+    
+    try:
+        # 5) impacket
+        from impacket.ntlm import compute_nthash
+        compute_nthash('')
+        return lambda password: compute_nthash(password).hex().lower()
+    except Exception as e:
+        logger.debug(f"[DEBUG] impacket compute_nthash unavailable: {e}")
+    
+    return None
+
+
+_ntlm_backend = _resolve_ntlm_backend()
+
+
+def _ntlm_hash_chunk(passwords: List[str]) -> List[str]:
+    """
+    Hash a list of passwords with the resolved NT hash backend.
+    
+    Module level so it can be dispatched to worker processes.
+    
+    Args:
+        passwords: Passwords to hash
+        
+    Returns:
+        Lowercase hexadecimal hash strings, in input order
+    """
+    if _md4 is not None:
+        md4 = _md4
+        return [md4(password.encode('utf-16le')).hex() for password in passwords]
+    backend = _ntlm_backend
+    return [backend(password).lower() for password in passwords]
+
 
 @dataclass
 class Config:
@@ -63,16 +179,23 @@ class Config:
         Path(self.report_directory).mkdir(parents=True, exist_ok=True)
 
 
+# Read buffer for the NTDS and cracked password files
+READ_BUFFER_SIZE = 1 << 20
+
+
 class NTDSProcessor:
     """Handles parsing and processing of NTDS files."""
     
-    # Regex patterns for different NTDS formats
-    NTDS_PATTERNS = [
-        # DOMAIN\user:rest format
-    re.compile(r'^(?P<domain>[^\\]+)\\(?P<user>[^:]+):(?P<nt>[0-9A-Fa-f]{32}).*$', re.I),
-        # pwdump style format
-    re.compile(r'^(?P<user>[^:]+):(?P<rid>\d+):(?P<lm>[0-9A-Fa-f]{32}|\*):(?P<nt>[0-9A-Fa-f]{32}|\*):.*$', re.I),
-]
+    # Number of parsed rows buffered before they are flushed with executemany
+    BATCH_SIZE = 10_000
+    
+    # NTDS line formats fused into one alternation, tried in order:
+    # DOMAIN\user:NT... first, then pwdump style user:rid:LM:NT:...
+    NTDS_PATTERN = re.compile(
+        r'^(?:(?P<d1>[^\\]+)\\(?P<u1>[^:]+):(?P<nt1>[0-9A-Fa-f]{32}).*'
+        r'|(?P<u2>[^:]+):\d+:(?:[0-9A-Fa-f]{32}|\*):(?P<nt2>[0-9A-Fa-f]{32}|\*):.*)$',
+        re.I
+    )
     
     @staticmethod
     def parse_ntds_line(line: str) -> Tuple[Optional[str], Optional[str]]:
@@ -85,11 +208,12 @@ class NTDSProcessor:
         Returns:
             Tuple of (username, nt_hash) or (None, None) if parsing fails
         """
-        for pattern in NTDSProcessor.NTDS_PATTERNS:
-            match = pattern.match(line.strip())
-            if match:
-                return match.group('user').lower(), match.group('nt').lower()
-        return None, None
+        match = NTDSProcessor.NTDS_PATTERN.match(line.strip())
+        if match is None:
+            return None, None
+        if match.group('u1') is not None:
+            return match.group('u1').lower(), match.group('nt1').lower()
+        return match.group('u2').lower(), match.group('nt2').lower()
 
     @staticmethod
     def load_kerberoast_ntds(file_path: str, encoding: str = 'cp1252', debug: bool = False) -> List[Tuple[str, str]]:
@@ -132,15 +256,28 @@ class NTDSProcessor:
         self.db_manager = db_manager
         self.accounts_read = 0
         self.accounts_filtered = 0
+        self._pending_rows = []
+        # Distinct NT hashes of current (non-history) passwords, tracked during
+        # ingestion so the summary does not need a COUNT(DISTINCT) sort
+        self.current_nt_hashes: Set[str] = set()
+        # Filter flags are read once here rather than per NTDS line
+        self._include_machine_accounts = config.include_machine_accounts
+        self._include_krbtgt = config.include_krbtgt
     
     def process_ntds_file(self) -> None:
         """Process the main NTDS file and populate database."""
         logger.info(f"Reading NTDS file: {self.config.ntds_file}")
         
         try:
-            with open(self.config.ntds_file, 'r', encoding='utf-8') as f:
+            with open(self.config.ntds_file, 'r', encoding='utf-8', errors='replace',
+                      buffering=READ_BUFFER_SIZE) as f:
                 for line_num, line in enumerate(f, 1):
                     self._process_ntds_line(line.strip())
+            
+            # Flush the remaining rows and commit the whole load as one transaction
+            self._flush_pending_rows()
+            self.db_manager.connection.commit()
+            self.db_manager.create_indexes()
                     
             self._log_processing_stats()
             
@@ -155,19 +292,17 @@ class NTDSProcessor:
         Args:
             line: Line from NTDS file
         """
-        if not line or ':' not in line:
-            return
-        
-        parts = line.split(':')
-        if len(parts) < 4:
+        # Only fields 0 (user), 2 (LM) and 3 (NT) are used; partition avoids
+        # building a list of every field
+        username_full, _, rest = line.partition(':')
+        _, _, rest = rest.partition(':')
+        lm_hash, sep, rest = rest.partition(':')
+        if not sep:
             return
+        nt_hash, _, _ = rest.partition(':')
         
         self.accounts_read += 1
         
-        username_full = parts[0]
-        lm_hash = parts[2]
-        nt_hash = parts[3]
-        
         # Split LM hash into left and right parts
         lm_hash_left = lm_hash[:16]
         lm_hash_right = lm_hash[16:32]
@@ -179,14 +314,15 @@ class NTDSProcessor:
         history_base_username = username_full
         history_index = -1
         
-        history_pattern = r"(?i)(.*\\*.*)_history([0-9]+)$"
-        history_match = re.search(history_pattern, username_full)
+        history_match = _HISTORY_RE.search(username_full)
         if history_match:
             history_base_username = history_match.group(1)
             history_index = int(history_match.group(2))
         
         # Apply account filtering
         if self._should_include_account(username):
+            if history_index == -1:
+                self.current_nt_hashes.add(nt_hash)
             self._insert_account_data(
                 username_full, username, lm_hash, lm_hash_left, 
                 lm_hash_right, nt_hash, history_index, history_base_username
@@ -204,21 +340,19 @@ class NTDSProcessor:
         Returns:
             True if account should be included
         """
-        # Exclude machine accounts (ending with $) unless explicitly included
-        if not self.config.include_machine_accounts and username.endswith("$"):
-            return False
-        
-        # Exclude krbtgt account unless explicitly included
-        if not self.config.include_krbtgt and username == "krbtgt":
-            return False
-        
-        return True
+        # Exclude machine accounts (ending with $) and the krbtgt account
+        # unless explicitly included
+        return ((self._include_machine_accounts or username[-1:] != "$")
+                and (self._include_krbtgt or username != "krbtgt"))
     
     def _insert_account_data(self, username_full: str, username: str, lm_hash: str,
                            lm_hash_left: str, lm_hash_right: str, nt_hash: str,
                            history_index: int, history_base_username: str) -> None:
         """
-        Insert account data into database.
+        Queue account data for insertion into the database.
+        
+        Rows are buffered and written with executemany once BATCH_SIZE
+        rows have accumulated.
         
         Args:
             username_full: Full username (domain\\user)
@@ -230,17 +364,28 @@ class NTDSProcessor:
             history_index: Password history index
             history_base_username: Base username for history
         """
+        has_lm = 0 if lm_hash.lower() == LM_EMPTY else 1
+        self._pending_rows.append((
+            username_full, username, lm_hash, lm_hash_left, 
+            lm_hash_right, nt_hash, history_index, history_base_username, has_lm
+        ))
+        if len(self._pending_rows) >= self.BATCH_SIZE:
+            self._flush_pending_rows()
+    
+    def _flush_pending_rows(self) -> None:
+        """Write all buffered account rows to the database."""
+        if not self._pending_rows:
+            return
+        
         sql = """
             INSERT INTO hash_infos 
             (username_full, username, lm_hash, lm_hash_left, lm_hash_right, 
-             nt_hash, history_index, history_base_username) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+             nt_hash, history_index, history_base_username, has_lm) 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         
-        self.db_manager.cursor.execute(sql, (
-            username_full, username, lm_hash, lm_hash_left, 
-            lm_hash_right, nt_hash, history_index, history_base_username
-        ))
+        self.db_manager.cursor.executemany(sql, self._pending_rows)
+        self._pending_rows = []
     
     def _log_processing_stats(self) -> None:
         """Log processing statistics."""
@@ -255,25 +400,41 @@ class NTDSProcessor:
     
     def update_group_membership(self, group_manager: 'GroupManager') -> None:
         """
-        Update group membership flags in database.
+        Record group membership in the group_members table.
         
         Args:
             group_manager: Group manager instance
         """
-        for group_name, users in group_manager.group_users.items():
-            for user in users:
-                sql = f'UPDATE hash_infos SET "{group_name}" = 1 WHERE username_full = ?'
-                self.db_manager.cursor.execute(sql, (user,))
+        rows = [(group_name, user)
+                for group_name, users in group_manager.group_users.items()
+                for user in users]
+        
+        sql = "INSERT OR IGNORE INTO group_members (group_name, username_full) VALUES (?, ?)"
+        self.db_manager.cursor.executemany(sql, rows)
+        self.db_manager.connection.commit()
 
 
 class HashProcessor:
     """Handles password hashing and cracking operations."""
     
+    # Batches with at least this many distinct passwords are hashed in a
+    # process pool, in chunks of PARALLEL_CHUNK_SIZE
+    PARALLEL_HASH_THRESHOLD = 50_000
+    PARALLEL_CHUNK_SIZE = 10_000
+    
+    # Accounts whose username candidates are generated and hashed together
+    # in the by-hash username check, bounding how many are held at once
+    CANDIDATE_ACCOUNT_SLICE = 10_000
+    
     @staticmethod
+    @lru_cache(maxsize=65536)
     def ntlm_hash(password: str) -> str:
         """
         Generate NT hash (MD4 over UTF-16LE) of a password.
         
+        Results are memoized, since the same candidates recur across
+        accounts (e.g. LM passwords shared by differently cased NT passwords).
+        
         Args:
             password: Password to hash
             
@@ -283,45 +444,46 @@ class HashProcessor:
         Raises:
             RuntimeError: If no MD4 backend is available
         """
-        data = password.encode('utf-16le')
-        
-        # Try different MD4 backends in order of preference
-        try:
-            # 1) pycryptodome → Crypto.* (preferred since we know it's installed)
-            from Crypto.Hash import MD4
-            return MD4.new(data).hexdigest().lower()
-        except Exception as e:
-            logger.debug(f"[DEBUG] PyCryptodome (Crypto) MD4 failed: {e}")
-        
-        try:
-            # 2) pycryptodomex (alternative) → Cryptodome.*
-            from Cryptodome.Hash import MD4
-            return MD4.new(data).hexdigest().lower()
-        except Exception as e:
-            logger.debug(f"[DEBUG] PyCryptodomex (Cryptodome) MD4 failed: {e}")
-        
-        try:
-            # 3) hashlib (often unavailable for MD4)
-            import hashlib
-            return hashlib.new('md4', data).hexdigest().lower()
-        except Exception as e:
-            logger.debug(f"[DEBUG] hashlib md4 unavailable: {e}")
-        
-        try:
-            # 4) passlib
-            from passlib.hash import nthash
-            return nthash.hash(password).lower()
-        except Exception as e:
-            logger.debug(f"[DEBUG] passlib nthash failed: {e}")
+        if _ntlm_backend is None:
+            raise RuntimeError("No NT hash backend available. Install pycryptodome (or pycryptodomex) / passlib / impacket.")
+        return _ntlm_backend(password)
+
+    @staticmethod
+    def ntlm_hash_batch(passwords: Iterable[str]) -> Dict[str, str]:
+        """
+        Generate NT hashes for many passwords at once.
         
-        try:
-            # 5) impacket
-            from impacket.ntlm import compute_nthash
-            return compute_nthash(password).hex().lower()
-        except Exception as e:
-            logger.debug(f"[DEBUG] impacket compute_nthash failed: {e}")
+        Each distinct password is hashed once. With an MD4 backend the
+        digests are computed directly over the UTF-16LE bytes, without going
+        through ntlm_hash per password. Large batches are split across a
+        process pool.
         
-        raise RuntimeError("No NT hash backend available. Install pycryptodome (or pycryptodomex) / passlib / impacket.")
+        Args:
+            passwords: Passwords to hash; duplicates are allowed
+            
+        Returns:
+            Mapping of password to lowercase hexadecimal hash string
+            
+        Raises:
+            RuntimeError: If no MD4 backend is available
+        """
+        if _ntlm_backend is None:
+            raise RuntimeError("No NT hash backend available. Install pycryptodome (or pycryptodomex) / passlib / impacket.")
+        
+        unique_passwords = list(dict.fromkeys(passwords))
+        hashes = None
+        if len(unique_passwords) >= HashProcessor.PARALLEL_HASH_THRESHOLD and (os.cpu_count() or 1) > 1:
+            chunk_size = HashProcessor.PARALLEL_CHUNK_SIZE
+            chunks = [unique_passwords[i:i + chunk_size] for i in range(0, len(unique_passwords), chunk_size)]
+            try:
+                with ProcessPoolExecutor() as executor:
+                    hashes = [h for chunk_hashes in executor.map(_ntlm_hash_chunk, chunks) for h in chunk_hashes]
+            except (OSError, BrokenProcessPool) as e:
+                logger.debug(f"Parallel hashing unavailable, hashing serially: {e}")
+        
+        if hashes is None:
+            hashes = _ntlm_hash_chunk(unique_passwords)
+        return dict(zip(unique_passwords, hashes))
 
     @staticmethod
     def generate_username_candidates(username: str, username_full: Optional[str] = None) -> Set[str]:
@@ -336,37 +498,44 @@ class HashProcessor:
             Set of possible password candidates
         """
         candidates = set()
-        
         for val in (username, username_full):
-            if not val:
-                continue
-                
-            val = val.strip()
-            if not val:
-                continue
-                
-            candidates.add(val)
-            
-            # Extract username from domain\\user format
-            if '\\' in val:
-                candidates.add(val.split('\\', 1)[1])
+            if val:
+                candidates |= HashProcessor._value_candidates(val)
+        return candidates
+    
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _value_candidates(val: str) -> FrozenSet[str]:
+        """
+        Expand one username value into its password candidates.
+        
+        Memoized on the exact value, since the same account name recurs
+        across the domains of a multi-domain dump.
+        
+        Args:
+            val: Username or full username
             
-            # Extract username from user@domain format
-            if '@' in val:
-                candidates.add(val.split('@', 1)[0])
+        Returns:
+            Frozen set of candidates (empty for a blank value)
+        """
+        val = val.strip()
+        if not val:
+            return frozenset()
+        
+        bases = {val}
+        
+        # Extract username from domain\\user format
+        if '\\' in val:
+            bases.add(val.split('\\', 1)[1])
+        
+        # Extract username from user@domain format
+        if '@' in val:
+            bases.add(val.split('@', 1)[0])
         
         # Generate case variants
-        final_candidates = set()
-        for candidate in candidates:
-            if candidate:
-                final_candidates.update([
-                    candidate,
-                    candidate.lower(),
-                    candidate.upper(),
-                    candidate.capitalize()
-                ])
-        
-        return final_candidates
+        return frozenset(variant
+                         for base in bases if base
+                         for variant in (base, base.lower(), base.upper(), base.capitalize()))
     
     @staticmethod
     def all_casings(input_string: str):
@@ -456,11 +625,63 @@ class DataSanitizer:
                 sanitized_row[idx] = DataSanitizer.sanitize_value(str(sanitized_row[idx]))
         
         return tuple(sanitized_row)
+    
+    @staticmethod
+    def sanitize_rows(rows: Sequence[Tuple], password_indices: List[int], hash_indices: List[int],
+                      should_sanitize: bool = True) -> Sequence[Tuple]:
+        """
+        Sanitize passwords and hashes in a list of table rows.
+        
+        Args:
+            rows: Table row tuples
+            password_indices: Column indices containing passwords
+            hash_indices: Column indices containing hashes
+            should_sanitize: Whether to apply sanitization
+            
+        Returns:
+            The original rows when not sanitizing, otherwise sanitized copies
+        """
+        if not should_sanitize:
+            return rows
+        return [DataSanitizer.sanitize_table_row(row, password_indices, hash_indices)
+                for row in rows]
+    
+    @staticmethod
+    def sanitize_sql(column: str) -> str:
+        """
+        Build an SQL expression that redacts a column like sanitize_value.
+        
+        Args:
+            column: Column name or expression to redact
+            
+        Returns:
+            SQL expression yielding the sanitized value
+        """
+        return (
+            f"CASE WHEN LENGTH({column}) = 32 "
+            f"THEN substr({column}, 1, 4) || '{'*' * 24}' || substr({column}, -4) "
+            f"WHEN LENGTH({column}) > 2 "
+            f"THEN substr({column}, 1, 1) || replace(hex(zeroblob(LENGTH({column}) - 2)), '00', '*') "
+            f"|| substr({column}, -1) "
+            f"ELSE {column} END"
+        )
 
 
 class HTMLReportBuilder:
     """Builds HTML reports with proper structure and styling."""
     
+    HTML_HEAD = (
+        "<!DOCTYPE html>\n<html>\n<head>\n"
+        "<meta charset='utf-8'>\n<meta name='viewport' content='width=device-width,initial-scale=1'>\n"
+        "<link rel='stylesheet' href='report.css'>\n"
+        "<script src='https://cdn.jsdelivr.net/npm/chart.js'></script>\n"
+        "<title>DPAT Report</title>\n"
+        "</head>\n<body>\n"
+    )
+    HTML_TAIL = "\n</body>\n</html>\n"
+    # Number of body fragments joined per write when streaming a report to disk
+    WRITE_BATCH_SIZE = 4096
+    
     def __init__(self, report_directory: str):
         """
         Initialize HTML report builder.
@@ -469,7 +690,18 @@ class HTMLReportBuilder:
             report_directory: Directory to save reports
         """
         self.report_directory = report_directory
-        self.body_content = ""
+        # Body fragments are collected and joined once, avoiding repeated
+        # reallocation of an ever-growing string on large reports
+        self._parts: List[str] = []
+    
+    @property
+    def body_content(self) -> str:
+        """HTML body assembled from the content added so far."""
+        return "".join(self._parts)
+    
+    @body_content.setter
+    def body_content(self, content: str) -> None:
+        self._parts = [content] if content else []
     
     def add_content(self, content: str) -> None:
         """
@@ -478,9 +710,10 @@ class HTMLReportBuilder:
         Args:
             content: HTML content to add
         """
-        self.body_content += content + "\n<div class='section-space'></div>\n"
+        self._parts.append(content)
+        self._parts.append("\n<div class='section-space'></div>\n")
     
-    def add_table(self, rows: Sequence[Sequence], headers: Sequence[str] = (), 
+    def add_table(self, rows: Iterable[Sequence], headers: Sequence[str] = (), 
                   cols_to_not_escape: Union[int, Sequence[int], None] = (),
                   caption: Optional[str] = None) -> None:
         """
@@ -502,12 +735,12 @@ class HTMLReportBuilder:
         html_parts = ["<div class='table-wrap'>", "<table class='report'>"]
         
         if caption:
-            html_parts.append(f"<caption>{html.escape(caption)}</caption>")
+            html_parts.append(f"<caption>{_esc(caption)}</caption>")
         
         # Header
         html_parts.append("<thead><tr>")
         for header in headers:
-            html_parts.append(f"<th>{'' if header is None else html.escape(str(header))}</th>")
+            html_parts.append(f"<th>{'' if header is None else _esc(str(header))}</th>")
         html_parts.append("</tr></thead>")
         
         # Body
@@ -515,14 +748,15 @@ class HTMLReportBuilder:
         for row in rows:
             html_parts.append("<tr>")
             for idx, cell in enumerate(row):
-                cell_data = "" if cell is None else str(cell)
+                cell_data = "" if cell is None else cell if isinstance(cell, str) else str(cell)
                 if idx not in cols_to_not_escape:
-                    cell_data = html.escape(cell_data)
+                    cell_data = _esc(cell_data)
                 html_parts.append(f"<td>{cell_data}</td>")
             html_parts.append("</tr>")
         html_parts.append("</tbody></table></div>")
         
-        self.add_content("".join(html_parts))
+        self._parts.append("".join(html_parts))
+        self._parts.append("\n<div class='section-space'></div>\n")
     
     def add_chart(self, chart_id: str, chart_type: str, data: dict, options: dict = None) -> None:
         """
@@ -569,16 +803,7 @@ class HTMLReportBuilder:
         Returns:
             Complete HTML document string
         """
-        return (
-            "<!DOCTYPE html>\n<html>\n<head>\n"
-            "<meta charset='utf-8'>\n<meta name='viewport' content='width=device-width,initial-scale=1'>\n"
-            "<link rel='stylesheet' href='report.css'>\n"
-            "<script src='https://cdn.jsdelivr.net/npm/chart.js'></script>\n"
-            "<title>DPAT Report</title>\n"
-            "</head>\n<body>\n"
-            + self.body_content +
-            "\n</body>\n</html>\n"
-        )
+        return "".join([self.HTML_HEAD, *self._parts, self.HTML_TAIL])
     
     def write_report(self, filename: str) -> str:
         """
@@ -592,18 +817,34 @@ class HTMLReportBuilder:
         """
         file_path = Path(self.report_directory) / filename
         
-        # Copy CSS file
-        css_source = Path(__file__).parent / "report.css"
-        css_dest = Path(self.report_directory) / "report.css"
-        if css_source.exists():
-            copyfile(css_source, css_dest)
-        
-        # Write HTML file
+        # Stream the body in joined batches rather than building the whole
+        # document as one string, which would double peak memory on large reports
+        parts = self._parts
+        batch = self.WRITE_BATCH_SIZE
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(self.generate_html())
+            f.write(self.HTML_HEAD)
+            for start in range(0, len(parts), batch):
+                f.write("".join(parts[start:start + batch]))
+            f.write(self.HTML_TAIL)
         
         logger.info(f"Report written: {file_path}")
         return filename
+    
+    @staticmethod
+    def copy_stylesheet(report_directory: str) -> None:
+        """
+        Copy report.css into the report directory.
+        
+        Every report links the same stylesheet, so this is done once per run
+        rather than on each write_report call.
+        
+        Args:
+            report_directory: Directory the reports are written to
+        """
+        css_source = Path(__file__).parent / "report.css"
+        css_dest = Path(report_directory) / "report.css"
+        if css_source.exists():
+            copyfile(css_source, css_dest)
 
 
 class DatabaseManager:
@@ -635,14 +876,21 @@ class DatabaseManager:
         
         self.connection.text_factory = str
         self.cursor = self.connection.cursor()
+        
+        # The database is scratch space rebuilt on every run, so trade
+        # durability for bulk-load speed
+        self.cursor.execute("PRAGMA journal_mode=MEMORY")
+        self.cursor.execute("PRAGMA synchronous=OFF")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-262144")  # 256 MiB page cache
         logger.info("Database connection established")
     
     def create_schema(self, group_names: List[str]) -> None:
         """
-        Create database schema with group columns.
+        Create database schema.
         
         Args:
-            group_names: List of group names to create columns for
+            group_names: List of group names that will be loaded
         """
         # Create main table
         self.cursor.execute('''
@@ -658,28 +906,81 @@ class DatabaseManager:
                 lm_pass_right text,
                 only_lm_cracked boolean,
                 history_index int,
-                history_base_username text
+                history_base_username text,
+                has_lm int
             )
         ''')
         
-        # Create indexes
+        # Create group membership table
+        self.cursor.execute('''
+            CREATE TABLE group_members (
+                group_name text,
+                username_full text collate nocase,
+                PRIMARY KEY (group_name, username_full)
+            )
+        ''')
+        
+        logger.info(f"Database schema created for {len(group_names)} groups")
+    
+    def create_indexes(self) -> None:
+        """
+        Create the hash_infos indexes.
+        
+        Called once the NTDS file has been bulk loaded so the inserts do not
+        pay for per-row index maintenance.
+        """
         indexes = [
-            "CREATE INDEX index_nt_hash ON hash_infos (nt_hash)",
-            "CREATE INDEX index_lm_hash_left ON hash_infos (lm_hash_left)",
-            "CREATE INDEX index_lm_hash_right ON hash_infos (lm_hash_right)",
-            "CREATE INDEX lm_hash ON hash_infos (lm_hash)",
-            "CREATE INDEX username ON hash_infos (username)"
+            "CREATE INDEX IF NOT EXISTS index_nt_hash ON hash_infos (nt_hash)",
+            "CREATE INDEX IF NOT EXISTS index_lm_hash_left ON hash_infos (lm_hash_left)",
+            "CREATE INDEX IF NOT EXISTS index_lm_hash_right ON hash_infos (lm_hash_right)",
+            "CREATE INDEX IF NOT EXISTS ix_nt ON hash_infos (nt_hash) WHERE history_index = -1"
         ]
         
         for index_sql in indexes:
             self.cursor.execute(index_sql)
+    
+    def create_current_table(self) -> None:
+        """
+        Materialize the current (non-history) hashes for reporting.
         
-        # Create group columns
-        for group_name in group_names:
-            sql = f'ALTER TABLE hash_infos ADD COLUMN "{group_name}" boolean'
-            self.cursor.execute(sql)
+        Called once cracked passwords have been applied. The reporting
+        queries only look at current passwords, so copying them into a
+        temporary table lets every report scan just those rows instead of
+        filtering the full password history each time.
+        """
+        # Declared explicitly rather than via CREATE TABLE AS so the nocase
+        # collations on the username columns carry over
+        self.cursor.execute('''
+            CREATE TEMP TABLE current_infos (
+                username_full text collate nocase,
+                username text collate nocase,
+                lm_hash text,
+                nt_hash text,
+                password text,
+                only_lm_cracked boolean,
+                history_base_username text,
+                has_lm int
+            )
+        ''')
+        self.cursor.execute('''
+            INSERT INTO current_infos 
+            SELECT username_full, username, lm_hash, nt_hash, password, 
+                   only_lm_cracked, history_base_username, has_lm 
+            FROM hash_infos 
+            WHERE history_index = -1 
+            ORDER BY rowid
+        ''')
         
-        logger.info(f"Database schema created with {len(group_names)} group columns")
+        indexes = [
+            "CREATE INDEX temp.ix_cur_nt ON current_infos (nt_hash)",
+            "CREATE INDEX temp.ix_cur_lm ON current_infos (lm_hash)",
+            "CREATE INDEX temp.ix_cur_pw ON current_infos (password)",
+            "CREATE INDEX temp.ix_cur_plen ON current_infos (LENGTH(password))"
+        ]
+        
+        for index_sql in indexes:
+            self.cursor.execute(index_sql)
+        self.connection.commit()
     
     def close(self) -> None:
         """Close database connection."""
@@ -719,10 +1020,15 @@ class GroupManager:
         # Files to exclude from group processing
         exclude_files = {'.ntds', '.pot', '.potfile', '.dit'}
         
-        for file_path in sorted(group_dir.iterdir()):
-            if file_path.is_file():
+        # scandir entries carry cached file type info, saving a stat per entry
+        with os.scandir(group_dir) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        
+        for entry in entries:
+            if entry.is_file():
+                file_path = Path(entry.path)
                 # Skip non-group files
-                if any(file_path.suffix.lower() in exclude_files for exclude in exclude_files):
+                if file_path.suffix.lower() in exclude_files:
                     logger.debug(f"Skipping non-group file: {file_path.name}")
                     continue
                     
@@ -848,10 +1154,17 @@ class CrackedPasswordProcessor:
         """Process the cracked password file."""
         logger.info(f"Reading cracked password file: {self.config.cracked_file}")
         
+        rows = []
+        
         try:
-            with open(self.config.cracked_file, 'r', encoding='utf-8') as f:
+            with open(self.config.cracked_file, 'r', encoding='utf-8', errors='replace',
+                      buffering=READ_BUFFER_SIZE) as f:
                 for line_num, line in enumerate(f, 1):
-                    self._process_cracked_line(line.strip())
+                    parsed = self._parse_cracked_line(line.strip())
+                    if parsed is not None:
+                        rows.append(parsed)
+            
+            self._apply_cracked_rows(rows)
                     
         except Exception as e:
             logger.error(f"Error processing cracked file: {e}")
@@ -864,12 +1177,23 @@ class CrackedPasswordProcessor:
         Args:
             line: Line from cracked password file
         """
-        if ':' not in line:
-            return
+        parsed = self._parse_cracked_line(line)
+        if parsed is not None:
+            self._apply_cracked_rows([parsed])
+    
+    def _parse_cracked_line(self, line: str) -> Optional[Tuple[str, str]]:
+        """
+        Parse a single line from the cracked password file.
         
-        colon_index = line.find(':')
-        hash_value = line[:colon_index]
-        password = line[colon_index + 1:]
+        Args:
+            line: Line from cracked password file
+            
+        Returns:
+            Tuple of (hash, password) or None if the line is not a hash:password pair
+        """
+        hash_value, sep, password = line.partition(':')
+        if not sep:
+            return None
         
         # Handle John the Ripper format ($NT$ and $LM$ prefixes)
         is_jtr = False
@@ -878,15 +1202,10 @@ class CrackedPasswordProcessor:
             is_jtr = True
         
         # Handle hex encoded passwords
-        if re.match(r"\$HEX\[([^\]]+)", password) and not is_jtr:
+        if not is_jtr:
             password = self._decode_hex_password(password)
         
-        # Update database based on hash length
-        hash_length = len(hash_value)
-        if hash_length == 32:  # NT hash
-            self._update_nt_hash_password(hash_value, password)
-        elif hash_length == 16:  # LM hash
-            self._update_lm_hash_password(hash_value, password)
+        return hash_value, password
     
     def _decode_hex_password(self, password: str) -> str:
         """
@@ -899,39 +1218,52 @@ class CrackedPasswordProcessor:
             Decoded password string
         """
         try:
-            hex_match = re.findall(r"\$HEX\[([^\]]+)", password)
+            hex_match = _HEX_RE.match(password)
             if hex_match:
-                hex_data = binascii.unhexlify(hex_match[-1])
-                return ''.join(chr(x) if isinstance(x, int) else x for x in hex_data)
+                hex_data = binascii.unhexlify(hex_match.group(1))
+                # Each byte maps to the code point of the same value
+                return hex_data.decode('latin-1')
         except Exception as e:
             logger.debug(f"Error decoding hex password: {e}")
         
         return password
     
-    def _update_nt_hash_password(self, hash_value: str, password: str) -> None:
+    def _apply_cracked_rows(self, rows: List[Tuple[str, str]]) -> None:
         """
-        Update NT hash with cracked password.
+        Update NT and LM hashes with cracked passwords.
         
-        Args:
-            hash_value: NT hash
-            password: Cracked password
-        """
-        sql = "UPDATE hash_infos SET password = ? WHERE nt_hash = ?"
-        self.db_manager.cursor.execute(sql, (password, hash_value))
-    
-    def _update_lm_hash_password(self, hash_value: str, password: str) -> None:
-        """
-        Update LM hash with cracked password.
+        The rows are staged in a temporary table and applied with one
+        set-based UPDATE per hash column instead of one UPDATE per row.
+        When a hash appears more than once the last password wins.
         
         Args:
-            hash_value: LM hash
-            password: Cracked password
+            rows: List of (hash, password) tuples
         """
-        sql_left = "UPDATE hash_infos SET lm_pass_left = ? WHERE lm_hash_left = ?"
-        sql_right = "UPDATE hash_infos SET lm_pass_right = ? WHERE lm_hash_right = ?"
-        
-        self.db_manager.cursor.execute(sql_left, (password, hash_value))
-        self.db_manager.cursor.execute(sql_right, (password, hash_value))
+        cursor = self.db_manager.cursor
+        cursor.execute("CREATE TEMP TABLE pot (h TEXT PRIMARY KEY, p TEXT, lenh INT)")
+        try:
+            cursor.executemany(
+                "INSERT OR REPLACE INTO pot (h, p, lenh) VALUES (?, ?, ?)",
+                ((hash_value, password, len(hash_value)) for hash_value, password in rows
+                 if len(hash_value) in (16, 32))
+            )
+            
+            # NT hashes
+            cursor.execute('''
+                UPDATE hash_infos SET password = (SELECT p FROM pot WHERE h = hash_infos.nt_hash)
+                WHERE nt_hash IN (SELECT h FROM pot WHERE lenh = 32)
+            ''')
+            
+            # LM hash halves
+            for half in ("left", "right"):
+                cursor.execute(f'''
+                    UPDATE hash_infos SET lm_pass_{half} = (SELECT p FROM pot WHERE h = hash_infos.lm_hash_{half})
+                    WHERE lm_hash_{half} IN (SELECT h FROM pot WHERE lenh = 16)
+                ''')
+        finally:
+            cursor.execute("DROP TABLE pot")
+        
+        self.db_manager.connection.commit()
     
     def perform_lm_cracking(self) -> None:
         """Perform additional LM-based NT hash cracking."""
@@ -940,7 +1272,7 @@ class CrackedPasswordProcessor:
             FROM hash_infos 
             WHERE (lm_pass_left IS NOT NULL OR lm_pass_right IS NOT NULL) 
               AND password IS NULL 
-              AND lm_hash != "aad3b435b51404eeaad3b435b51404ee" 
+              AND has_lm = 1 
             GROUP BY nt_hash
         '''
         
@@ -954,6 +1286,9 @@ class CrackedPasswordProcessor:
                 password = self._crack_nt_from_lm(nt_hash, lm_pass_left, lm_pass_right)
                 if password:
                     self._update_cracked_password(nt_hash, password)
+            
+            # Release the memoized candidate hashes
+            HashProcessor.ntlm_hash.cache_clear()
     
     def _crack_nt_from_lm(self, nt_hash: str, lm_pass_left: Optional[str], 
                           lm_pass_right: Optional[str]) -> Optional[str]:
@@ -974,6 +1309,22 @@ class CrackedPasswordProcessor:
         if lm_pass_right:
             lm_password += lm_pass_right
         
+        # Most real passwords use one of a handful of casings; try those
+        # before walking all 2^n of them
+        try:
+            for password_guess in self._likely_casings(lm_password):
+                if nt_hash.lower() == HashProcessor.ntlm_hash(password_guess).lower():
+                    return password_guess
+        except RuntimeError as e:
+            logger.error(f"NT hash backend unavailable for cracking: {e}")
+            return None
+        
+        if _md4 is not None:
+            try:
+                return self._crack_casings_md4(nt_hash, lm_password)
+            except ValueError as e:
+                logger.debug(f"Falling back to generic LM cracking: {e}")
+        
         try:
             for password_guess in HashProcessor.all_casings(lm_password):
                 try:
@@ -988,6 +1339,76 @@ class CrackedPasswordProcessor:
         
         return None
     
+    @staticmethod
+    def _likely_casings(lm_password: str) -> List[str]:
+        """
+        Generate the most common casings of an LM password.
+        
+        Args:
+            lm_password: Case-insensitive password recovered from the LM hash
+            
+        Returns:
+            Distinct candidate casings, most likely first
+        """
+        lower = lm_password.lower()
+        candidates = [
+            lower,
+            lower.capitalize(),
+            lm_password.upper(),
+            lm_password.title(),
+            lower[:-1] + lower[-1:].upper(),
+        ]
+        return list(dict.fromkeys(candidates))
+    
+    @staticmethod
+    def _crack_casings_md4(nt_hash: str, lm_password: str) -> Optional[str]:
+        """
+        Search every upper/lower casing of an LM password for the NT hash.
+        
+        The casings are walked in Gray-code order over a UTF-16LE buffer so
+        each candidate differs from the previous one by a single character
+        and is hashed without building an intermediate string.
+        
+        Args:
+            nt_hash: NT hash to crack
+            lm_password: Case-insensitive password recovered from the LM hash
+            
+        Returns:
+            Cracked password or None
+            
+        Raises:
+            ValueError: If the hash is not hex or the password has characters
+                whose casings are not single UTF-16 code units
+        """
+        target = bytes.fromhex(nt_hash)
+        md4 = _md4
+        
+        buf = bytearray()
+        slots = []  # (byte offset, lower variant, upper variant) per cased char
+        for char in lm_password:
+            lower = char.lower().encode('utf-16le')
+            upper = char.upper().encode('utf-16le')
+            if len(lower) != 2 or len(upper) != 2:
+                raise ValueError(f"unsupported character {char!r}")
+            if lower != upper:
+                slots.append((len(buf), lower, upper))
+            buf += lower
+        
+        if md4(buf) == target:
+            return buf.decode('utf-16le')
+        
+        state = 0
+        for i in range(1, 1 << len(slots)):
+            # Flip the lowest set bit of i to step to the next Gray code
+            bit = (i & -i).bit_length() - 1
+            state ^= 1 << bit
+            offset, lower, upper = slots[bit]
+            buf[offset:offset + 2] = upper if state >> bit & 1 else lower
+            if md4(buf) == target:
+                return buf.decode('utf-16le')
+        
+        return None
+    
     def _update_cracked_password(self, nt_hash: str, password: str) -> None:
         """
         Update database with cracked password.
@@ -1091,8 +1512,9 @@ Examples:
 def prompt_user_to_open_report(config: Config) -> None:
     """Prompt user to open the report in browser."""
     try:
-        if config.no_prompt:
-            # Skip browser prompt when --no-prompt is specified
+        if config.no_prompt or sys.stdin is None or not sys.stdin.isatty():
+            # Skip browser prompt when --no-prompt is specified or nobody is
+            # at the terminal to answer it (CI, cron, piped stdin)
             logger.info(f"Report available at: {os.path.join(config.report_directory, config.output_file)}")
             return
         
@@ -1131,6 +1553,8 @@ def main():
         logger.info(f"Processing NTDS file: {config.ntds_file}")
         logger.info(f"Processing cracked file: {config.cracked_file}")
         
+        HTMLReportBuilder.copy_stylesheet(config.report_directory)
+        
         # Initialize components
         db_manager = DatabaseManager(config)
         group_manager = GroupManager(config)
@@ -1161,7 +1585,7 @@ def main():
                                     WHERE (lm_pass_left IS NOT NULL OR lm_pass_right IS NOT NULL) 
                                     AND history_index = -1 
                                     AND password IS NULL 
-                                    AND lm_hash != "aad3b435b51404eeaad3b435b51404ee" 
+                                    AND has_lm = 1 
                                     GROUP BY lm_hash''')
         lm_cracked_nt_not_rows = db_manager.cursor.fetchall()
         
@@ -1171,6 +1595,8 @@ def main():
         # Now perform LM cracking
         cracked_processor.perform_lm_cracking()
         
+        db_manager.create_current_table()
+        
         # Create groups summary entry if groups were processed
         if config.groups_directory and group_manager.groups:
             groups_summary_entry = (len(group_manager.groups), None, "Group Cracking Statistics", "groups_stats.html")
@@ -1178,40 +1604,48 @@ def main():
         # Generate comprehensive reports
         logger.info("Generating comprehensive reports...")
         
-        # Get total hash count
-        db_manager.cursor.execute('SELECT count(*) FROM hash_infos WHERE history_index = -1')
-        total_hashes = db_manager.cursor.fetchone()[0]
+        # Gather the summary counters in a single scan
+        db_manager.cursor.execute('''SELECT count(*), count(password), count(DISTINCT password) 
+                                    FROM current_infos''')
+        total_hashes, cracked_count, unique_passwords_cracked = db_manager.cursor.fetchone()
+        unique_hashes = len(ntds_processor.current_nt_hashes)
+        
+        if config.debug_mode:
+            db_manager.cursor.execute('SELECT count(DISTINCT nt_hash) FROM current_infos')
+            sql_unique_hashes = db_manager.cursor.fetchone()[0]
+            if sql_unique_hashes != unique_hashes:
+                logger.warning(f"Unique hash count mismatch: tracked {unique_hashes}, database {sql_unique_hashes}")
         
         if total_hashes == 0:
             logger.warning("No password hashes found in NTDS file")
             logger.info("Exiting gracefully...")
             sys.exit(0)
         
-        # Generate all hashes report
-        sql = '''
-            SELECT username_full, password, LENGTH(password) as plen, nt_hash, only_lm_cracked 
-            FROM hash_infos 
-            WHERE history_index = -1 
-            ORDER BY plen DESC, password
+        # Generate all hashes report; when sanitizing, redact inside SQLite so
+        # the full secrets never reach Python for the largest table
+        if config.sanitize_output:
+            password_col = sanitizer.sanitize_sql("current_infos.password")
+            nt_hash_col = sanitizer.sanitize_sql("current_infos.nt_hash")
+        else:
+            password_col, nt_hash_col = "password", "nt_hash"
+        sql = f'''
+            SELECT username_full, {password_col}, LENGTH(current_infos.password) as plen, {nt_hash_col}, only_lm_cracked 
+            FROM current_infos 
+            ORDER BY plen DESC, current_infos.password, current_infos.rowid
         '''
         
-        rows = db_manager.cursor.execute(sql).fetchall()
-        sanitized_rows = [sanitizer.sanitize_table_row(row, [1], [3], config.sanitize_output) 
-                         for row in rows]
-        
+        # Rows are streamed from the cursor straight into the table
         report_builder = HTMLReportBuilder(config.report_directory)
-        report_builder.add_table(sanitized_rows, 
+        report_builder.add_table(db_manager.cursor.execute(sql), 
                                ["Username", "Password", "Password Length", "NT Hash", "Only LM Cracked"])
         report_builder.write_report("all_hashes.html")
         
         # Initialize summary table
         summary_table = []
-        summary_table.append((len(rows), None, "Password Hashes", '<a href="all_hashes.html">Details</a>'))
+        summary_table.append((total_hashes, None, "Password Hashes", '<a href="all_hashes.html">Details</a>'))
         
         
         # Unique hashes
-        db_manager.cursor.execute('SELECT count(DISTINCT nt_hash) FROM hash_infos WHERE history_index = -1')
-        unique_hashes = db_manager.cursor.fetchone()[0]
         unique_percent = calculate_percentage(unique_hashes, total_hashes)
         summary_table.append((unique_hashes, unique_percent, "Unique Password Hashes", None))
         
@@ -1221,16 +1655,10 @@ def main():
         summary_table.append((duplicate_hashes, duplicate_percent, "Duplicate Password Hashes Identified Through Audit", None))
         
         # Cracked passwords
-        db_manager.cursor.execute('SELECT count(*) FROM hash_infos WHERE password IS NOT NULL AND history_index = -1')
-        cracked_count = db_manager.cursor.fetchone()[0]
         cracked_percent = calculate_percentage(cracked_count, total_hashes)
         summary_table.append((cracked_count, cracked_percent, "Passwords Discovered Through Cracking", None))
         
         # Number of UNIQUE passwords that were cracked
-        db_manager.cursor.execute('''SELECT count(DISTINCT password) 
-                                    FROM hash_infos 
-                                    WHERE password IS NOT NULL AND history_index = -1''')
-        unique_passwords_cracked = db_manager.cursor.fetchone()[0]
         unique_passwords_percent = calculate_percentage(unique_passwords_cracked, total_hashes)
         summary_table.append((unique_passwords_cracked, unique_passwords_percent, 
                             "Unique Passwords Discovered Through Cracking", None))
@@ -1242,23 +1670,29 @@ def main():
             
             if kerb_rows:
                 # Extract unique usernames from kerberoast entries
-                kerb_usernames = tuple({u for u, _ in kerb_rows})  # de-dupe set → tuple
-                total_kerb_accts = len(kerb_usernames)
-                placeholders = ",".join("?" * total_kerb_accts)
+                kerb_usernames = {u for u, _ in kerb_rows}
                 
-                db_manager.cursor.execute(f'''
-                    SELECT username_full, nt_hash, password
-                    FROM   hash_infos
-                    WHERE  username_full IN ({placeholders})
-                      AND  password IS NOT NULL
-                      AND  history_index = -1
-                ''', kerb_usernames)
-                cracked_kerb_rows = db_manager.cursor.fetchall()
+                # Join against a temp table rather than binding one IN-list
+                # parameter per account
+                db_manager.cursor.execute(
+                    "CREATE TEMP TABLE kerb_users (u TEXT PRIMARY KEY COLLATE NOCASE)")
+                try:
+                    db_manager.cursor.executemany("INSERT OR IGNORE INTO kerb_users VALUES (?)",
+                                                  ((u,) for u in kerb_usernames))
+                    db_manager.cursor.execute('''
+                        SELECT h.username_full, h.nt_hash, h.password
+                        FROM   current_infos h
+                        JOIN   kerb_users k ON k.u = h.username_full
+                        WHERE  h.password IS NOT NULL
+                        ORDER  BY h.rowid
+                    ''')
+                    cracked_kerb_rows = db_manager.cursor.fetchall()
+                finally:
+                    db_manager.cursor.execute("DROP TABLE kerb_users")
                 
                 if cracked_kerb_rows:
                     # Sanitize passwords and hashes in the data
-                    sanitized_kerb_rows = [sanitizer.sanitize_table_row(row, [2], [1], config.sanitize_output) 
-                                         for row in cracked_kerb_rows]  # password at index 2, nt_hash at index 1
+                    sanitized_kerb_rows = sanitizer.sanitize_rows(cracked_kerb_rows, [2], [1], config.sanitize_output)  # password at index 2, nt_hash at index 1
                     
                     kerb_builder = HTMLReportBuilder(config.report_directory)
                     kerb_builder.add_table(sanitized_kerb_rows, 
@@ -1288,18 +1722,17 @@ def main():
             summary_table.append(groups_entry_with_link)
         
         # Password Policy Violations
-        db_manager.cursor.execute(f'SELECT count(*) FROM hash_infos WHERE LENGTH(password) < ? AND password IS NOT NULL AND history_index = -1', (config.min_password_length,))
+        db_manager.cursor.execute(f'SELECT count(*) FROM current_infos WHERE LENGTH(password) < ? AND password IS NOT NULL', (config.min_password_length,))
         policy_violations = db_manager.cursor.fetchone()[0]
         policy_percent = calculate_percentage(policy_violations, cracked_count) if cracked_count > 0 else 0
         
         if policy_violations > 0:
             db_manager.cursor.execute(f'''SELECT username_full, password, LENGTH(password) as plen, nt_hash 
-                                        FROM hash_infos 
-                                        WHERE LENGTH(password) < ? AND password IS NOT NULL AND history_index = -1
+                                        FROM current_infos 
+                                        WHERE LENGTH(password) < ? AND password IS NOT NULL
                                         ORDER BY plen''', (config.min_password_length,))
             policy_rows = db_manager.cursor.fetchall()
-            sanitized_policy_rows = [sanitizer.sanitize_table_row(row, [1], [3], config.sanitize_output) 
-                                   for row in policy_rows]
+            sanitized_policy_rows = sanitizer.sanitize_rows(policy_rows, [1], [3], config.sanitize_output)
             
             policy_builder = HTMLReportBuilder(config.report_directory)
             policy_builder.add_table(sanitized_policy_rows, 
@@ -1309,14 +1742,13 @@ def main():
         
         # Username equals password (cracked)
         db_manager.cursor.execute('''SELECT username_full, password, LENGTH(password) as plen, nt_hash 
-                                    FROM hash_infos 
-                                    WHERE password IS NOT NULL AND history_index = -1 
-                                    AND LOWER(username) = LOWER(password)''')
+                                    FROM current_infos 
+                                    WHERE password IS NOT NULL AND password != '' 
+                                    AND username = password COLLATE NOCASE''')
         username_password_rows = db_manager.cursor.fetchall()
         
         if username_password_rows:
-            sanitized_up_rows = [sanitizer.sanitize_table_row(row, [1], [3], config.sanitize_output) 
-                               for row in username_password_rows]
+            sanitized_up_rows = sanitizer.sanitize_rows(username_password_rows, [1], [3], config.sanitize_output)
             
             up_builder = HTMLReportBuilder(config.report_directory)
             up_builder.add_table(sanitized_up_rows, 
@@ -1333,57 +1765,77 @@ def main():
         hash_processor = HashProcessor()
         already_flagged = set()
         
-        # Track users already found by the cracked password check to avoid duplicates
+        # Track users already found by the cracked password check to avoid
+        # duplicates; usernames are keyed casefolded, matching the database's
+        # case-insensitive username column
         if username_password_rows:
-            already_flagged.update(row[0].split('\\')[-1] for row in username_password_rows)  # Extract username from username_full
+            already_flagged.update(row[0].split('\\')[-1].casefold() for row in username_password_rows)  # Extract username from username_full
         
         # Get all accounts with NT hashes for hash comparison
-        db_manager.cursor.execute('''SELECT username_full, username, nt_hash, password 
-                                    FROM hash_infos 
-                                    WHERE history_index = -1 
-                                    AND nt_hash IS NOT NULL 
+        db_manager.cursor.execute('''SELECT rowid, username_full, username, nt_hash, password 
+                                    FROM current_infos 
+                                    WHERE nt_hash IS NOT NULL 
                                     AND username IS NOT NULL''')
-        hash_comparison_rows = db_manager.cursor.fetchall()
-        
-        offenders_hashed = []
         
-        for username_full, username, nt_hash, cracked_password in hash_comparison_rows:
-            # Skip if already flagged by cracked password check
-            if username in already_flagged:
+        # Stream the accounts, keeping only those not already flagged; each
+        # username and cracked password is casefolded once here
+        hash_comparison_rows = []
+        for rowid, username_full, username, nt_hash, cracked_password in db_manager.cursor:
+            username_cf = username.casefold()
+            if username_cf in already_flagged:
                 continue
-            
-            # Quick check: if we have a cracked password, check equality one more time (case-insensitive)
-            if cracked_password:
-                if cracked_password.lower() == username.lower():
-                    offenders_hashed.append((username_full, cracked_password, len(cracked_password), nt_hash))
+            cracked_matches = bool(cracked_password) and cracked_password.casefold() == username_cf
+            hash_comparison_rows.append((rowid, username_full, username, username_cf,
+                                         nt_hash, cracked_password, cracked_matches))
+        
+        # Hash the username-derived candidates of the accounts still to be
+        # checked one slice at a time, then compare each against its own
+        # account's NT hash
+        matched_candidates = {}
+        slice_size = HashProcessor.CANDIDATE_ACCOUNT_SLICE
+        for start in range(0, len(hash_comparison_rows), slice_size):
+            account_candidates = []
+            for (rowid, username_full, username, _, nt_hash, _,
+                 cracked_matches) in hash_comparison_rows[start:start + slice_size]:
+                if cracked_matches:
                     continue
-            
-            # Generate username-based password candidates and compare by NT hash
-            candidates = hash_processor.generate_username_candidates(username, username_full)
+                nt_hash_lower = nt_hash.lower()
+                for candidate in hash_processor.generate_username_candidates(username, username_full):
+                    account_candidates.append((rowid, nt_hash_lower, candidate))
             
             try:
-                target_hash = nt_hash.lower()
-            except Exception:
-                target_hash = nt_hash
+                candidate_hashes = hash_processor.ntlm_hash_batch(candidate for _, _, candidate in account_candidates)
+            except RuntimeError as e:
+                logger.debug(f"NT hash backend unavailable: {e}")
+                break
+            for rowid, nt_hash_lower, candidate in account_candidates:
+                # A candidate only counts against the account it was derived from
+                if candidate_hashes[candidate] == nt_hash_lower:
+                    matched_candidates[rowid] = candidate
+        
+        # Release the memoized username expansions
+        HashProcessor._value_candidates.cache_clear()
+        
+        offenders_hashed = []
+        
+        for (rowid, username_full, _, username_cf, nt_hash,
+             cracked_password, cracked_matches) in hash_comparison_rows:
+            # Skip if already flagged by a previous match
+            if username_cf in already_flagged:
+                continue
             
-            matched = False
-            for candidate in candidates:
-                try:
-                    candidate_hash = hash_processor.ntlm_hash(candidate)
-                    if candidate_hash.lower() == target_hash:
-                        offenders_hashed.append((username_full, candidate, len(candidate), nt_hash))
-                        matched = True
-                        break
-                except RuntimeError as e:
-                    logger.debug(f"NT hash backend unavailable: {e}")
-                    break
+            # Quick check: a cracked password equal to the username (case-insensitive)
+            if cracked_matches:
+                offenders_hashed.append((username_full, cracked_password, len(cracked_password), nt_hash))
+                continue
             
-            if matched:
-                already_flagged.add(username)  # Prevent duplicates
+            candidate = matched_candidates.get(rowid)
+            if candidate is not None:
+                offenders_hashed.append((username_full, candidate, len(candidate), nt_hash))
+                already_flagged.add(username_cf)  # Prevent duplicates
         
         if offenders_hashed:
-            sanitized_hash_rows = [sanitizer.sanitize_table_row(row, [1], [3], config.sanitize_output) 
-                                 for row in offenders_hashed]
+            sanitized_hash_rows = sanitizer.sanitize_rows(offenders_hashed, [1], [3], config.sanitize_output)
             
             hash_builder = HTMLReportBuilder(config.report_directory)
             hash_builder.add_table(sanitized_hash_rows, 
@@ -1396,26 +1848,25 @@ def main():
             summary_table.append((0, 0, "Accounts Using Username As Password Not Cracked (by hash)", None))
         
         # LM Hash Statistics
-        db_manager.cursor.execute('SELECT count(*) FROM hash_infos WHERE lm_hash != "aad3b435b51404eeaad3b435b51404ee" AND history_index = -1')
+        db_manager.cursor.execute('SELECT count(*) FROM current_infos WHERE has_lm = 1')
         lm_hashes = db_manager.cursor.fetchone()[0]
         lm_percent = calculate_percentage(lm_hashes, total_hashes)
         summary_table.append((lm_hashes, lm_percent, "LM Hashes (Non-blank)", None))
         
-        db_manager.cursor.execute('SELECT count(DISTINCT lm_hash) FROM hash_infos WHERE lm_hash != "aad3b435b51404eeaad3b435b51404ee" AND history_index = -1')
+        db_manager.cursor.execute('SELECT count(DISTINCT lm_hash) FROM current_infos WHERE has_lm = 1')
         unique_lm_hashes = db_manager.cursor.fetchone()[0]
         unique_lm_percent = calculate_percentage(unique_lm_hashes, total_hashes)
         summary_table.append((unique_lm_hashes, unique_lm_percent, "Unique LM Hashes (Non-blank)", None))
         
         # Passwords only cracked via LM
         db_manager.cursor.execute('''SELECT username_full, password, LENGTH(password) as plen, only_lm_cracked 
-                                    FROM hash_infos 
-                                    WHERE only_lm_cracked = 1 AND history_index = -1 
+                                    FROM current_infos 
+                                    WHERE only_lm_cracked = 1 
                                     ORDER BY plen''')
         lm_only_rows = db_manager.cursor.fetchall()
         
         if lm_only_rows:
-            sanitized_lm_only_rows = [sanitizer.sanitize_table_row(row, [1], [], config.sanitize_output) 
-                                     for row in lm_only_rows]
+            sanitized_lm_only_rows = sanitizer.sanitize_rows(lm_only_rows, [1], [], config.sanitize_output)
             
             lm_only_builder = HTMLReportBuilder(config.report_directory)
             lm_only_builder.add_table(sanitized_lm_only_rows, 
@@ -1427,8 +1878,7 @@ def main():
         # Add LM hash analysis if we found any
         if lm_cracked_count > 0:
             # Generate the LM noncracked report
-            sanitized_lm_rows = [sanitizer.sanitize_table_row(row, [1, 2], [0, 3], config.sanitize_output) 
-                               for row in lm_cracked_nt_not_rows]
+            sanitized_lm_rows = sanitizer.sanitize_rows(lm_cracked_nt_not_rows, [1, 2], [0, 3], config.sanitize_output)
             
             lm_builder = HTMLReportBuilder(config.report_directory)
             lm_builder.add_table(sanitized_lm_rows, 
@@ -1442,50 +1892,47 @@ def main():
         
         # Top Password Statistics
         db_manager.cursor.execute('''SELECT password, COUNT(password) as count 
-                                    FROM hash_infos 
-                                    WHERE password IS NOT NULL AND history_index = -1 AND password != "" 
-                                    GROUP BY password ORDER BY count DESC LIMIT 20''')
+                                    FROM current_infos 
+                                    WHERE password IS NOT NULL AND password != '' 
+                                    GROUP BY password ORDER BY count DESC, password DESC LIMIT 20''')
         top_password_rows = db_manager.cursor.fetchall()
         
         if top_password_rows:
-            sanitized_top_rows = [sanitizer.sanitize_table_row(row, [0], [], config.sanitize_output) 
-                                for row in top_password_rows]
+            sanitized_top_rows = sanitizer.sanitize_rows(top_password_rows, [0], [], config.sanitize_output)
             
             top_builder = HTMLReportBuilder(config.report_directory)
             top_builder.add_table(sanitized_top_rows, ["Password", "Count"])
             top_filename = top_builder.write_report("top_password_stats.html")
             summary_table.append((None, None, "Top Password Use Stats", f'<a href="{top_filename}">Details</a>'))
         
-        # Password Length Statistics
-        db_manager.cursor.execute('''SELECT LENGTH(password) as plen, COUNT(password) as count 
-                                    FROM hash_infos 
-                                    WHERE password IS NOT NULL AND history_index = -1 AND LENGTH(password) > 0 
-                                    GROUP BY plen ORDER BY plen''')
-        length_rows = db_manager.cursor.fetchall()
+        # Password Length Statistics: one ordered pass over the cracked accounts,
+        # grouped by length in Python, replaces a query per distinct length
+        db_manager.cursor.execute('''SELECT LENGTH(password) as plen, username_full 
+                                    FROM current_infos 
+                                    WHERE password IS NOT NULL AND LENGTH(password) > 0 
+                                    ORDER BY plen, rowid''')
+        length_groups = itertools.groupby(db_manager.cursor, key=lambda row: row[0])
+        
+        length_rows = []
+        for counter, (plen, group_rows) in enumerate(length_groups):
+            # Create individual detail page for this password length
+            usernames = [(username_full,) for _, username_full in group_rows]
+            
+            length_detail_builder = HTMLReportBuilder(config.report_directory)
+            length_detail_builder.add_table(usernames, [f"Users with a password length of {plen}"])
+            detail_filename = length_detail_builder.write_report(f"{counter}length_usernames.html")
+            
+            length_rows.append((plen, len(usernames), f'<a href="{detail_filename}">Details</a>'))
         
         if length_rows:
-            # Create individual detail pages for each password length
-            counter = 0
-            for plen, count in length_rows:
-                db_manager.cursor.execute('SELECT username_full FROM hash_infos WHERE history_index = -1 AND LENGTH(password) = ?', (plen,))
-                usernames = db_manager.cursor.fetchall()
-                
-                length_detail_builder = HTMLReportBuilder(config.report_directory)
-                length_detail_builder.add_table(usernames, [f"Users with a password length of {plen}"])
-                detail_filename = length_detail_builder.write_report(f"{counter}length_usernames.html")
-                
-                # Add Details link to the row
-                length_rows[counter] = (plen, count, f'<a href="{detail_filename}">Details</a>')
-                counter += 1
-            
             length_builder = HTMLReportBuilder(config.report_directory)
             length_builder.add_table(length_rows, ["Password Length", "Count", "Details"], cols_to_not_escape=2)
             
             # Add second table ordered by count DESC
             db_manager.cursor.execute('''SELECT COUNT(password) as count, LENGTH(password) as plen 
-                                        FROM hash_infos 
-                                        WHERE password IS NOT NULL AND history_index = -1 AND LENGTH(password) > 0 
-                                        GROUP BY plen ORDER BY count DESC''')
+                                        FROM current_infos 
+                                        WHERE password IS NOT NULL AND LENGTH(password) > 0 
+                                        GROUP BY plen ORDER BY count DESC, plen DESC''')
             count_ordered_rows = db_manager.cursor.fetchall()
             length_builder.add_table(count_ordered_rows, ["Count", "Password Length"])
             
@@ -1494,20 +1941,26 @@ def main():
         
         # Password Reuse Statistics
         db_manager.cursor.execute('''SELECT nt_hash, COUNT(nt_hash) as count, password 
-                                    FROM hash_infos 
-                                    WHERE nt_hash != "31d6cfe0d16ae931b73c59d7e0c089c0" AND history_index = -1 
-                                    GROUP BY nt_hash ORDER BY count DESC LIMIT 20''')
+                                    FROM current_infos 
+                                    WHERE nt_hash != ? 
+                                    GROUP BY nt_hash ORDER BY count DESC, nt_hash LIMIT 20''', (NT_EMPTY,))
         reuse_rows = db_manager.cursor.fetchall()
         
         if reuse_rows:
+            # Fetch the users sharing any of the top hashes in one query
+            reuse_hashes = [row[0] for row in reuse_rows]
+            placeholders = ",".join("?" * len(reuse_hashes))
+            db_manager.cursor.execute(f'''SELECT nt_hash, username_full FROM current_infos 
+                                         WHERE nt_hash IN ({placeholders}) 
+                                         ORDER BY username_full''', reuse_hashes)
+            reuse_users_by_hash = {}
+            for nt_hash, username_full in db_manager.cursor.fetchall():
+                reuse_users_by_hash.setdefault(nt_hash, []).append(username_full)
+            
             # Process each reuse row to add details links
             processed_reuse_rows = []
             for counter, (nt_hash, hit_count, password) in enumerate(reuse_rows):
-                # Get usernames sharing this hash
-                db_manager.cursor.execute('''SELECT username_full FROM hash_infos 
-                                            WHERE nt_hash = ? AND history_index = -1 
-                                            ORDER BY username_full''', (nt_hash,))
-                usernames = [row[0] for row in db_manager.cursor.fetchall()]
+                usernames = reuse_users_by_hash.get(nt_hash, [])
                 
                 # Create individual details page for this password reuse
                 details_builder = HTMLReportBuilder(config.report_directory)
@@ -1526,8 +1979,7 @@ def main():
                 # Add details link to the row
                 processed_reuse_rows.append((nt_hash, hit_count, password, f'<a href="{details_filename}">Details</a>'))
             
-            sanitized_reuse_rows = [sanitizer.sanitize_table_row(row, [2], [0], config.sanitize_output) 
-                                   for row in processed_reuse_rows]
+            sanitized_reuse_rows = sanitizer.sanitize_rows(processed_reuse_rows, [2], [0], config.sanitize_output)
             
             reuse_builder = HTMLReportBuilder(config.report_directory)
             reuse_builder.add_table(sanitized_reuse_rows, ["NT Hash", "Count", "Password", "Details"], cols_to_not_escape=3)
@@ -1539,19 +1991,19 @@ def main():
         max_history = db_manager.cursor.fetchone()[0]
         
         if max_history is not None and max_history >= 0:
-            password_history_headers = ["Username", "Current Password"]
-            column_names = ["cp"]
-            command = 'SELECT * FROM ( SELECT history_base_username'
+            history_indices = range(-1, max_history + 1)
+            password_history_headers = ["Username", "Current Password"] + [f"History {i}" for i in history_indices if i >= 0]
+            pivot_columns = [f'MIN(CASE WHEN history_index = {i} THEN password END) {"cp" if i == -1 else f"h{i}"}'
+                             for i in history_indices]
             
-            for i in range(-1, max_history + 1):
-                if i == -1:
-                    column_names.append("cp")
-                else:
-                    password_history_headers.append(f"History {i}")
-                    column_names.append(f"h{i}")
-                command += f', MIN(CASE WHEN history_index = {i} THEN password END) {column_names[-1]}'
-            
-            command += ' FROM hash_infos GROUP BY history_base_username) WHERE coalesce(' + ",".join(column_names) + ') is not NULL'
+            # Only accounts with at least one cracked password (current or
+            # historical) are pivoted, rather than discarding empty rows afterwards
+            command = "".join([
+                'WITH keeps AS (SELECT DISTINCT history_base_username FROM hash_infos WHERE password IS NOT NULL) ',
+                'SELECT history_base_username, ',
+                ", ".join(pivot_columns),
+                ' FROM hash_infos WHERE history_base_username IN keeps GROUP BY history_base_username'
+            ])
             
             db_manager.cursor.execute(command)
             history_rows = db_manager.cursor.fetchall()
@@ -1576,8 +2028,8 @@ def main():
         # Add charts after the summary table
         # Password Length Distribution Chart
         db_manager.cursor.execute('''SELECT LENGTH(password) as plen, COUNT(password) as count 
-                                    FROM hash_infos 
-                                    WHERE password IS NOT NULL AND history_index = -1 AND LENGTH(password) > 0 
+                                    FROM current_infos 
+                                    WHERE password IS NOT NULL AND LENGTH(password) > 0 
                                     GROUP BY plen ORDER BY plen''')
         length_data = db_manager.cursor.fetchall()
         
@@ -1655,9 +2107,9 @@ def main():
         
         # Top 10 Most Common Passwords Chart
         db_manager.cursor.execute('''SELECT password, COUNT(password) as count 
-                                    FROM hash_infos 
-                                    WHERE password IS NOT NULL AND history_index = -1 AND password != "" 
-                                    GROUP BY password ORDER BY count DESC LIMIT 10''')
+                                    FROM current_infos 
+                                    WHERE password IS NOT NULL AND password != '' 
+                                    GROUP BY password ORDER BY count DESC, password DESC LIMIT 10''')
         top_passwords = db_manager.cursor.fetchall()
         
         if top_passwords:
@@ -1714,69 +2166,83 @@ def main():
             group_summary_rows = []
             group_page_headers = ["Group Name", "Total Members", "Cracked Members", "Cracked %", "Members Details", "Cracked Details"]
             
+            # Collect the users sharing each group member's hash with one ordered scan
+            db_manager.cursor.execute('''SELECT nt_hash, username_full FROM current_infos 
+                                        WHERE nt_hash IN (
+                                            SELECT h.nt_hash FROM group_members g 
+                                            JOIN current_infos h ON h.username_full = g.username_full)
+                                        ORDER BY username_full''')
+            users_by_hash = {}
+            for nt_hash, username_full in db_manager.cursor.fetchall():
+                users_by_hash.setdefault(nt_hash, []).append(username_full)
+            sharing_by_hash = {}
+            
             for group_name, _ in group_manager.groups:
                 # Get group member count
-                db_manager.cursor.execute(f'SELECT count(*) FROM hash_infos WHERE "{group_name}" = 1 AND history_index = -1')
+                db_manager.cursor.execute('''SELECT count(*) FROM group_members g 
+                                            JOIN current_infos h ON h.username_full = g.username_full 
+                                            WHERE g.group_name = ?''', (group_name,))
                 num_groupmembers = db_manager.cursor.fetchone()[0]
                 
                 # Get cracked count for this group
-                db_manager.cursor.execute(f'''SELECT count(*) FROM hash_infos 
-                                            WHERE "{group_name}" = 1 AND password IS NOT NULL AND password != '' AND history_index = -1''')
+                db_manager.cursor.execute('''SELECT count(*) FROM group_members g 
+                                            JOIN current_infos h ON h.username_full = g.username_full 
+                                            WHERE h.password IS NOT NULL AND h.password != '' AND g.group_name = ?''',
+                                          (group_name,))
                 num_groupmembers_cracked = db_manager.cursor.fetchone()[0]
                 
                 # Calculate percentage
                 percent_cracked = calculate_percentage(num_groupmembers_cracked, num_groupmembers)
                 
                 # Generate group members report
-                db_manager.cursor.execute(f'''SELECT username_full, nt_hash, password, lm_hash
-                                            FROM hash_infos 
-                                            WHERE "{group_name}" = 1 AND history_index = -1
-                                            ORDER BY username_full''')
+                db_manager.cursor.execute('''SELECT h.username_full, h.nt_hash, h.password, h.has_lm
+                                            FROM group_members g 
+                                            JOIN current_infos h ON h.username_full = g.username_full 
+                                            WHERE g.group_name = ?
+                                            ORDER BY h.username_full''', (group_name,))
                 member_rows = db_manager.cursor.fetchall()
                 
                 # Process member data to show sharing information
                 processed_member_rows = []
-                for username_full, nt_hash, password, lm_hash in member_rows:
-                    # Get all users sharing this hash
-                    db_manager.cursor.execute('''SELECT username_full FROM hash_infos 
-                                                WHERE nt_hash = ? AND history_index = -1 
-                                                ORDER BY username_full''', (nt_hash,))
-                    sharing_users = [row[0] for row in db_manager.cursor.fetchall()]
-                    share_count = len(sharing_users)
-                    
-                    # Create a string of sharing users (one per line)
-                    if share_count > 5:
-                        sharing_text = "<br>".join(sharing_users[:5]) + f"<br>(and {share_count - 5} more)"
-                    else:
-                        sharing_text = "<br>".join(sharing_users)
+                for username_full, nt_hash, password, has_lm in member_rows:
+                    if nt_hash not in sharing_by_hash:
+                        sharing_users = users_by_hash.get(nt_hash, [])
+                        share_count = len(sharing_users)
+                        
+                        # Create a string of sharing users (one per line)
+                        if share_count > 5:
+                            sharing_text = "<br>".join(sharing_users[:5]) + f"<br>(and {share_count - 5} more)"
+                        else:
+                            sharing_text = "<br>".join(sharing_users)
+                        sharing_by_hash[nt_hash] = (sharing_text, share_count)
+                    sharing_text, share_count = sharing_by_hash[nt_hash]
                     
                     # Determine if LM hash is non-blank
-                    lm_non_blank = "No" if lm_hash == "aad3b435b51404eeaad3b435b51404ee" else "Yes"
+                    lm_non_blank = "Yes" if has_lm else "No"
                     
                     processed_member_rows.append((username_full, nt_hash, sharing_text, share_count, password, lm_non_blank))
                 
                 # Sanitize member data
-                sanitized_member_rows = [sanitizer.sanitize_table_row(row, [4], [1], config.sanitize_output) 
-                                       for row in processed_member_rows]
+                sanitized_member_rows = sanitizer.sanitize_rows(processed_member_rows, [4], [1], config.sanitize_output)
                 
                 member_headers = ["Username", "NT Hash", "Users Sharing this Hash", "Share Count", "Password", "Non-Blank LM Hash?"]
                 member_builder = HTMLReportBuilder(config.report_directory)
                 member_builder.add_table(sanitized_member_rows, member_headers, cols_to_not_escape=2)
                 
                 # Sanitize group name for filename
-                safe_group_name = re.sub(r'[<>:"/\\|?*]', '_', group_name)
+                safe_group_name = _SAFE_NAME_RE.sub('_', group_name)
                 members_filename = member_builder.write_report(f"{safe_group_name}_members.html")
                 
                 # Generate cracked passwords report for this group
-                db_manager.cursor.execute(f'''SELECT username_full, LENGTH(password) as plen, password, only_lm_cracked
-                                            FROM hash_infos
-                                            WHERE "{group_name}" = 1 AND password IS NOT NULL AND password != '' AND history_index = -1
-                                            ORDER BY plen''')
+                db_manager.cursor.execute('''SELECT h.username_full, LENGTH(h.password) as plen, h.password, h.only_lm_cracked
+                                            FROM group_members g 
+                                            JOIN current_infos h ON h.username_full = g.username_full 
+                                            WHERE g.group_name = ? AND h.password IS NOT NULL AND h.password != ''
+                                            ORDER BY plen''', (group_name,))
                 cracked_rows = db_manager.cursor.fetchall()
                 
                 # Sanitize cracked data
-                sanitized_cracked_rows = [sanitizer.sanitize_table_row(row, [2], [], config.sanitize_output) 
-                                        for row in cracked_rows]
+                sanitized_cracked_rows = sanitizer.sanitize_rows(cracked_rows, [2], [], config.sanitize_output)
                 
                 cracked_headers = [f'Username of "{group_name}" Member', "Password Length", "Password", "Only LM Cracked"]
                 cracked_builder = HTMLReportBuilder(config.report_directory)
@@ -1803,6 +2269,9 @@ def main():
         # Close database
         db_manager.close()
         
+        # Release the largest report data before possibly waiting on the prompt
+        del report_builder, summary_builder, hash_comparison_rows, ntds_processor
+        
         # Prompt user to open report
         prompt_user_to_open_report(config)
         
@@ -119,7 +119,8 @@ class DatabaseTestHelper:
                 lm_pass_right text,
                 only_lm_cracked boolean,
                 history_index int,
-                history_base_username text
+                history_base_username text,
+                has_lm int
             )
         ''')
         
@@ -128,18 +129,20 @@ class DatabaseTestHelper:
             "CREATE INDEX index_nt_hash ON hash_infos (nt_hash)",
             "CREATE INDEX index_lm_hash_left ON hash_infos (lm_hash_left)",
             "CREATE INDEX index_lm_hash_right ON hash_infos (lm_hash_right)",
-            "CREATE INDEX lm_hash ON hash_infos (lm_hash)",
-            "CREATE INDEX username ON hash_infos (username)"
+            "CREATE INDEX ix_nt ON hash_infos (nt_hash) WHERE history_index = -1"
         ]
         
         for index_sql in indexes:
             cursor.execute(index_sql)
         
-        # Create group columns
-        if group_names:
-            for group_name in group_names:
-                sql = f'ALTER TABLE hash_infos ADD COLUMN "{group_name}" boolean'
-                cursor.execute(sql)
+        # Create group membership table
+        cursor.execute('''
+            CREATE TABLE group_members (
+                group_name text,
+                username_full text collate nocase,
+                PRIMARY KEY (group_name, username_full)
+            )
+        ''')
         
         conn.commit()
         return conn
@@ -153,8 +156,8 @@ class DatabaseTestHelper:
             cursor.execute('''
                 INSERT INTO hash_infos 
                 (username_full, username, lm_hash, lm_hash_left, lm_hash_right, 
-                 nt_hash, password, history_index, history_base_username) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 nt_hash, password, history_index, history_base_username, has_lm) 
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 row.get('username_full', ''),
                 row.get('username', ''),
@@ -164,7 +167,8 @@ class DatabaseTestHelper:
                 row.get('nt_hash', ''),
                 row.get('password', ''),
                 row.get('history_index', -1),
-                row.get('history_base_username', '')
+                row.get('history_base_username', ''),
+                0 if row.get('lm_hash', '').lower() == "aad3b435b51404eeaad3b435b51404ee" else 1
             ))
         
         conn.commit()
@@ -79,6 +79,10 @@ class TestNTDSProcessingIntegration(DPATTestCase):
         account_count = cursor.fetchone()[0]
         self.assertGreater(account_count, 0)
         
+        # Tracked unique hash count agrees with the database
+        cursor.execute("SELECT COUNT(DISTINCT nt_hash) FROM hash_infos WHERE history_index = -1")
+        self.assertEqual(len(ntds_processor.current_nt_hashes), cursor.fetchone()[0])
+        
         # Check that some passwords were cracked
         cursor.execute("SELECT COUNT(*) FROM hash_infos WHERE password IS NOT NULL AND history_index = -1")
         cracked_count = cursor.fetchone()[0]
@@ -86,7 +90,8 @@ class TestNTDSProcessingIntegration(DPATTestCase):
         
         # Check that group membership was updated
         for group_name in group_names:
-            cursor.execute(f'SELECT COUNT(*) FROM hash_infos WHERE "{group_name}" = 1')
+            cursor.execute('''SELECT COUNT(*) FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                             WHERE g.group_name = ?''', (group_name,))
             group_count = cursor.fetchone()[0]
             self.assertGreater(group_count, 0)
         
@@ -285,7 +290,7 @@ class TestGroupProcessingIntegration(DPATTestCase):
         group_manager.load_groups()
         group_manager.load_group_members()
         
-        # Create schema with group columns
+        # Create schema
         group_names = [group[0] for group in group_manager.groups]
         db_manager.create_schema(group_names)
         
@@ -297,7 +302,8 @@ class TestGroupProcessingIntegration(DPATTestCase):
         cursor = db_manager.cursor
         
         for group_name in group_names:
-            cursor.execute(f'SELECT COUNT(*) FROM hash_infos WHERE "{group_name}" = 1')
+            cursor.execute('''SELECT COUNT(*) FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                             WHERE g.group_name = ?''', (group_name,))
             count = cursor.fetchone()[0]
             self.assertGreater(count, 0, f"Group {group_name} should have members")
         
@@ -330,7 +336,7 @@ class TestGroupProcessingIntegration(DPATTestCase):
         group_manager.load_groups()
         group_manager.load_group_members()
         
-        # Create schema with group columns
+        # Create schema
         group_names = [group[0] for group in group_manager.groups]
         db_manager.create_schema(group_names)
         
@@ -345,7 +351,8 @@ class TestGroupProcessingIntegration(DPATTestCase):
         for group_name in group_names:
             # Generate group members report
             cursor = db_manager.cursor
-            cursor.execute(f'SELECT username_full, nt_hash FROM hash_infos WHERE "{group_name}" = 1 AND history_index = -1')
+            cursor.execute('''SELECT h.username_full, h.nt_hash FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                             WHERE g.group_name = ? AND h.history_index = -1''', (group_name,))
             member_rows = cursor.fetchall()
             
             if member_rows:
@@ -119,7 +119,7 @@ class TestSampleDataIntegration(DPATTestCase):
         group_manager.load_groups()
         group_manager.load_group_members()
         
-        # Create schema with group columns
+        # Create schema
         group_names = [group[0] for group in group_manager.groups]
         db_manager.create_schema(group_names)
         
@@ -141,16 +141,19 @@ class TestSampleDataIntegration(DPATTestCase):
         self.assertIn("Enterprise Admins", group_manager.group_users)
         
         # Check that group membership was updated in database
-        cursor.execute('SELECT COUNT(*) FROM hash_infos WHERE "Domain Admins" = 1')
+        cursor.execute('''SELECT COUNT(*) FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                         WHERE g.group_name = ?''', ("Domain Admins",))
         domain_admins_count = cursor.fetchone()[0]
         self.assertGreater(domain_admins_count, 0, "Should have Domain Admins members")
         
-        cursor.execute('SELECT COUNT(*) FROM hash_infos WHERE "Enterprise Admins" = 1')
+        cursor.execute('''SELECT COUNT(*) FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                         WHERE g.group_name = ?''', ("Enterprise Admins",))
         enterprise_admins_count = cursor.fetchone()[0]
         self.assertGreater(enterprise_admins_count, 0, "Should have Enterprise Admins members")
         
         # Verify specific admin accounts are in the database
-        cursor.execute('SELECT username_full FROM hash_infos WHERE "Domain Admins" = 1 LIMIT 5')
+        cursor.execute('''SELECT h.username_full FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                         WHERE g.group_name = ? LIMIT 5''', ("Domain Admins",))
         domain_admin_users = [row[0] for row in cursor.fetchall()]
         self.assertGreater(len(domain_admin_users), 0, "Should have Domain Admin users")
         
@@ -202,7 +205,7 @@ class TestSampleDataIntegration(DPATTestCase):
         group_manager.load_groups()
         group_manager.load_group_members()
         
-        # Create schema with group columns
+        # Create schema
         group_names = [group[0] for group in group_manager.groups]
         db_manager.create_schema(group_names)
         
@@ -223,12 +226,14 @@ class TestSampleDataIntegration(DPATTestCase):
         self.assertIn(powerview_group_name, group_manager.group_users)
         
         # Check that PowerView group membership was updated in database
-        cursor.execute(f'SELECT COUNT(*) FROM hash_infos WHERE "{powerview_group_name}" = 1')
+        cursor.execute('''SELECT COUNT(*) FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                         WHERE g.group_name = ?''', (powerview_group_name,))
         powerview_count = cursor.fetchone()[0]
         self.assertGreater(powerview_count, 0, "Should have PowerView group members")
         
         # Verify specific PowerView members are in the database
-        cursor.execute(f'SELECT username_full FROM hash_infos WHERE "{powerview_group_name}" = 1 LIMIT 5')
+        cursor.execute('''SELECT h.username_full FROM hash_infos h JOIN group_members g ON h.username_full = g.username_full 
+                         WHERE g.group_name = ? LIMIT 5''', (powerview_group_name,))
         powerview_users = [row[0] for row in cursor.fetchall()]
         self.assertGreater(len(powerview_users), 0, "Should have PowerView users")
         
@@ -15,10 +15,11 @@ import sqlite3
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import dpat
 from dpat import (
     Config, NTDSProcessor, HashProcessor, DataSanitizer, 
     HTMLReportBuilder, DatabaseManager, GroupManager, CrackedPasswordProcessor,
-    calculate_percentage
+    calculate_percentage, prompt_user_to_open_report
 )
 from tests import TestConfig, TestDataGenerator, DatabaseTestHelper, DPATTestCase
 
@@ -118,6 +119,21 @@ class TestNTDSProcessor(DPATTestCase):
         self.assertEqual(len(entries), 2)
         self.assertEqual(entries[0][0], "domain\\service1")  # Method converts to lowercase
         self.assertEqual(entries[1][0], "domain\\service2")  # Method converts to lowercase
+    
+    def test_has_lm_flag(self):
+        """Test that blank LM hashes are flagged at ingestion time."""
+        config = Config(ntds_file="test.ntds", cracked_file="test.pot", min_password_length=8)
+        db_manager = DatabaseManager(config)
+        db_manager.create_schema([])
+        processor = NTDSProcessor(config, db_manager)
+        
+        processor._process_ntds_line("DOMAIN\\blank:1001:AAD3B435B51404EEAAD3B435B51404EE:31d6cfe0d16ae931b73c59d7e0c089c0:::")
+        processor._process_ntds_line("DOMAIN\\lm:1002:e52cac67419a9a224a3b108f3fa6cb6d:8846f7eaee8fb117ad06bdd830b7586c:::")
+        processor._flush_pending_rows()
+        
+        rows = dict(db_manager.cursor.execute("SELECT username, has_lm FROM hash_infos").fetchall())
+        self.assertEqual(rows, {"blank": 0, "lm": 1})
+        db_manager.close()
 
 
 class TestHashProcessor(DPATTestCase):
@@ -138,7 +154,18 @@ class TestHashProcessor(DPATTestCase):
         self.assertIn("john@domain.com", candidates)
         self.assertIn("john", candidates)
         self.assertIn("John", candidates)
-    
+
+    def test_generate_username_candidates_cached(self):
+        """Test candidate expansion is reused for a repeated username."""
+        HashProcessor._value_candidates.cache_clear()
+        first = HashProcessor.generate_username_candidates("john", "CHILD\\john")
+        second = HashProcessor.generate_username_candidates("john", "PARENT\\john")
+
+        self.assertEqual(HashProcessor._value_candidates.cache_info().hits, 1)
+        self.assertIn("CHILD\\john", first)
+        self.assertNotIn("CHILD\\john", second)
+        self.assertEqual(HashProcessor.generate_username_candidates("  ", None), set())
+
     def test_all_casings(self):
         """Test case generation."""
         casings = list(HashProcessor.all_casings("ab"))
@@ -169,6 +196,28 @@ class TestHashProcessor(DPATTestCase):
         except RuntimeError as e:
             # If no backend is available, that's expected in test environment
             self.assertIn("No NT hash backend available", str(e))
+    
+    @unittest.skipUnless(dpat._ntlm_backend, "No NT hash backend available")
+    def test_ntlm_hash_batch(self):
+        """Test batched NT hashing matches per-password hashing."""
+        passwords = ["password", "Password", "password", "Möm Rülez!", ""]
+        hashes = HashProcessor.ntlm_hash_batch(passwords)
+        
+        self.assertEqual(set(hashes), set(passwords))
+        for password in passwords:
+            self.assertEqual(hashes[password], HashProcessor.ntlm_hash(password))
+        self.assertEqual(hashes[""], "31d6cfe0d16ae931b73c59d7e0c089c0")
+    
+    @unittest.skipUnless(dpat._ntlm_backend, "No NT hash backend available")
+    def test_ntlm_hash_batch_parallel(self):
+        """Test that the process pool path returns the same hashes."""
+        passwords = [f"candidate{i}" for i in range(7)]
+        with patch.object(HashProcessor, "PARALLEL_HASH_THRESHOLD", 2), \
+             patch.object(HashProcessor, "PARALLEL_CHUNK_SIZE", 3), \
+             patch("dpat.os.cpu_count", return_value=2):
+            hashes = HashProcessor.ntlm_hash_batch(passwords)
+        
+        self.assertEqual(hashes, {p: HashProcessor.ntlm_hash(p) for p in passwords})
 
 
 class TestDataSanitizer(DPATTestCase):
@@ -212,6 +261,27 @@ class TestDataSanitizer(DPATTestCase):
         self.assertEqual(result[0], "user1")  # Username unchanged
         self.assertEqual(result[1], "p*********3")  # Password sanitized
         self.assertEqual(result[2], "31d6************************89c0")  # Hash sanitized
+    
+    def test_sanitize_rows_disabled(self):
+        """Test that rows are returned untouched when sanitization is disabled."""
+        rows = [("user1", "password123")]
+        result = DataSanitizer.sanitize_rows(rows, [1], [], should_sanitize=False)
+        self.assertIs(result, rows)
+    
+    def test_sanitize_sql_matches_sanitize_value(self):
+        """Test that the SQL redaction expression matches sanitize_value."""
+        values = ["", "a", "ab", "abc", "password123", "Möm Rülez!",
+                  "31d6cfe0d16ae931b73c59d7e0c089c0"]
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE TABLE t (v TEXT)")
+            conn.executemany("INSERT INTO t VALUES (?)", [(v,) for v in values] + [(None,)])
+            results = conn.execute(f"SELECT v, {DataSanitizer.sanitize_sql('v')} FROM t").fetchall()
+        finally:
+            conn.close()
+        
+        for value, sanitized in results:
+            self.assertEqual(sanitized, DataSanitizer.sanitize_value(value))
 
 
 class TestHTMLReportBuilder(DPATTestCase):
@@ -270,6 +340,22 @@ class TestHTMLReportBuilder(DPATTestCase):
         report_path = self.temp_dir / "test_report.html"
         self.assert_file_exists(report_path)
         self.assert_file_contains(report_path, "<h1>Test Report</h1>")
+    
+    def test_write_report_batched(self):
+        """Test a report streamed in batches matches the generated document."""
+        builder = HTMLReportBuilder(str(self.temp_dir))
+        builder.add_table([(f"user{i}", "pässwörd") for i in range(50)], ["Username", "Password"])
+        
+        with patch.object(HTMLReportBuilder, 'WRITE_BATCH_SIZE', 7):
+            builder.write_report("batched.html")
+        
+        written = (self.temp_dir / "batched.html").read_text(encoding='utf-8')
+        self.assertEqual(written, builder.generate_html())
+    
+    def test_copy_stylesheet(self):
+        """Test copying the shared stylesheet into the report directory."""
+        HTMLReportBuilder.copy_stylesheet(str(self.temp_dir))
+        self.assert_file_exists(self.temp_dir / "report.css")
 
 
 class TestDatabaseManager(DPATTestCase):
@@ -307,13 +393,46 @@ class TestDatabaseManager(DPATTestCase):
         result = cursor.fetchone()
         self.assertIsNotNone(result)
         
-        # Check that group columns exist
+        # Check that group membership table exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='group_members'")
+        result = cursor.fetchone()
+        self.assertIsNotNone(result)
+        
+        # Groups are rows in group_members, not columns on hash_infos
         cursor.execute("PRAGMA table_info(hash_infos)")
         columns = [row[1] for row in cursor.fetchall()]
         
         for group_name in group_names:
-            self.assertIn(group_name, columns)
-    
+            self.assertNotIn(group_name, columns)
+
+    def test_create_current_table(self):
+        """Test the current hashes are materialized without history rows."""
+        config = Config(
+            ntds_file="test.ntds",
+            cracked_file="test.pot",
+            min_password_length=8
+        )
+
+        db_manager = DatabaseManager(config)
+        db_manager.create_schema([])
+        cursor = db_manager.cursor
+        cursor.executemany(
+            "INSERT INTO hash_infos (username_full, username, nt_hash, history_index, history_base_username) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [("DOMAIN\\Alice", "Alice", "aa", -1, "DOMAIN\\Alice"),
+             ("DOMAIN\\Alice_history0", "Alice_history0", "bb", 0, "DOMAIN\\Alice"),
+             ("DOMAIN\\Bob", "Bob", "cc", -1, "DOMAIN\\Bob")]
+        )
+
+        db_manager.create_current_table()
+
+        cursor.execute("SELECT username_full FROM current_infos ORDER BY rowid")
+        self.assertEqual([row[0] for row in cursor.fetchall()], ["DOMAIN\\Alice", "DOMAIN\\Bob"])
+
+        # Username comparisons stay case-insensitive
+        cursor.execute("SELECT count(*) FROM current_infos WHERE username = 'alice'")
+        self.assertEqual(cursor.fetchone()[0], 1)
+
     def test_close_database(self):
         """Test database connection closing."""
         config = Config(
@@ -452,6 +571,32 @@ class TestCrackedPasswordProcessor(DPATTestCase):
         result = cursor.fetchone()
         self.assertEqual(result[0], "password123")
     
+    def test_process_cracked_file_invalid_utf8(self):
+        """Test that undecodable potfile bytes do not abort processing."""
+        cracked_file = self.temp_dir / "invalid.pot"
+        cracked_file.write_bytes(b"5d41402abc4b2a76b9719d911017c592:bad\xffbyte\n"
+                                 b"31d6cfe0d16ae931b73c59d7e0c089c0:password123\n")
+        config = Config(
+            ntds_file="test.ntds",
+            cracked_file=str(cracked_file),
+            min_password_length=8
+        )
+        
+        db_manager = DatabaseManager(config)
+        db_manager.create_schema([])
+        cursor = db_manager.cursor
+        cursor.executemany('''
+            INSERT INTO hash_infos (username_full, username, nt_hash)
+            VALUES (?, ?, ?)
+        ''', [("DOMAIN\\user1", "user1", "31d6cfe0d16ae931b73c59d7e0c089c0"),
+              ("DOMAIN\\user2", "user2", "5d41402abc4b2a76b9719d911017c592")])
+        
+        CrackedPasswordProcessor(config, db_manager).process_cracked_file()
+        
+        passwords = dict(cursor.execute("SELECT username, password FROM hash_infos").fetchall())
+        self.assertEqual(passwords["user1"], "password123")
+        self.assertEqual(passwords["user2"], "bad\ufffdbyte")
+    
     def test_process_cracked_line_lm_hash(self):
         """Test processing LM hash cracked line."""
         config = Config(
@@ -500,6 +645,34 @@ class TestCrackedPasswordProcessor(DPATTestCase):
         result = processor._decode_hex_password(normal_password)
         self.assertEqual(result, "password123")
 
+    @unittest.skipUnless(dpat._ntlm_backend, "No NT hash backend available")
+    def test_crack_nt_from_lm(self):
+        """Test recovering the NT password casing from LM password halves."""
+        config = Config(
+            ntds_file="test.ntds",
+            cracked_file="test.pot",
+            min_password_length=8
+        )
+
+        db_manager = DatabaseManager(config)
+        processor = CrackedPasswordProcessor(config, db_manager)
+
+        nt_hash = HashProcessor.ntlm_hash("PaSsWoRd1")
+        self.assertEqual(processor._crack_nt_from_lm(nt_hash, "PASSWOR", "D1"), "PaSsWoRd1")
+        self.assertEqual(processor._crack_nt_from_lm(nt_hash.upper(), "PASSWOR", "D1"), "PaSsWoRd1")
+        self.assertIsNone(processor._crack_nt_from_lm(nt_hash, "XASSWOR", "D1"))
+
+        # Non-ASCII letters are toggled as well
+        nt_hash = HashProcessor.ntlm_hash("Möm")
+        self.assertEqual(processor._crack_nt_from_lm(nt_hash, "MÖM", None), "Möm")
+
+    def test_likely_casings(self):
+        """Test that common casings are generated first and without duplicates."""
+        self.assertEqual(CrackedPasswordProcessor._likely_casings("SUMMER2016"),
+                         ["summer2016", "Summer2016", "SUMMER2016"])
+        self.assertEqual(CrackedPasswordProcessor._likely_casings("HEY HEY"),
+                         ["hey hey", "Hey hey", "HEY HEY", "Hey Hey", "hey heY"])
+
 
 class TestUtilityFunctions(DPATTestCase):
     """Test utility functions."""
@@ -518,6 +691,37 @@ class TestUtilityFunctions(DPATTestCase):
         result = calculate_percentage(1, 3)
         self.assertEqual(result, 33.33)
     
+    def test_prompt_skipped_without_tty(self):
+        """Test the open-report prompt is skipped when stdin is not a terminal."""
+        config = Config(
+            ntds_file="test.ntds",
+            cracked_file="test.pot",
+            min_password_length=8
+        )
+        
+        with patch('dpat.sys.stdin') as mock_stdin, patch('builtins.input') as mock_input, \
+                patch('dpat.webbrowser.open') as mock_open_browser:
+            mock_stdin.isatty.return_value = False
+            prompt_user_to_open_report(config)
+        
+        mock_input.assert_not_called()
+        mock_open_browser.assert_not_called()
+    
+    def test_prompt_skipped_without_stdin(self):
+        """Test the open-report prompt is skipped when there is no stdin at all."""
+        config = Config(
+            ntds_file="test.ntds",
+            cracked_file="test.pot",
+            min_password_length=8
+        )
+        
+        with patch('dpat.sys.stdin', None), patch('builtins.input') as mock_input, \
+                patch('dpat.webbrowser.open') as mock_open_browser:
+            prompt_user_to_open_report(config)
+        
+        mock_input.assert_not_called()
+        mock_open_browser.assert_not_called()
+    
 
 
 if __name__ == '__main__':